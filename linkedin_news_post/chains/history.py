@@ -0,0 +1,44 @@
+from langchain_core.messages import AIMessage, AnyMessage, HumanMessage, trim_messages
+from langchain_core.messages.utils import count_tokens_approximately
+from langchain_core.runnables import RunnableLambda
+
+# Token budget for the conversation history sent with each chain call
+MAX_HISTORY_TOKENS = 4000
+
+
+def _last_tool_exchange_start(messages: list[AnyMessage]) -> int:
+    """Index of the last AI message that called a tool, or len(messages) if there is none."""
+    for i in range(len(messages) - 1, -1, -1):
+        if isinstance(messages[i], AIMessage) and messages[i].tool_calls:
+            return i
+    return len(messages)
+
+
+def trim_history(messages: list[AnyMessage]) -> list[AnyMessage]:
+    """Keep the latest tool exchange and the turns after it, plus the most recent earlier
+    turns that fit in what is left of MAX_HISTORY_TOKENS, starting on a human turn.
+
+    The tool exchange is the research the next step works from, so it is never dropped,
+    however long the tool output is.
+    """
+    start = _last_tool_exchange_start(messages)
+    head, tail = messages[:start], messages[start:]
+    budget = MAX_HISTORY_TOKENS - count_tokens_approximately(tail) if tail else MAX_HISTORY_TOKENS
+    kept = trim_messages(
+        head,
+        strategy="last",
+        max_tokens=max(budget, 0),
+        token_counter=count_tokens_approximately,
+        start_on="human",
+        include_system=True,
+    )
+    if tail and not any(isinstance(m, HumanMessage) for m in kept):
+        # The conversation must open on a human turn: keep the one that led to the tool call
+        last_human = next((m for m in reversed(head) if isinstance(m, HumanMessage)), None)
+        if last_human is not None:
+            kept = kept + [last_human]
+    return kept + tail
+
+
+# Put in front of a prompt so the supervisor loop does not resend the whole history
+trim_state = RunnableLambda(lambda state: {**state, "messages": trim_history(state["messages"])})
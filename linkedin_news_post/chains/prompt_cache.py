@@ -0,0 +1,11 @@
+from langchain_core.messages import SystemMessage
+
+# Anthropic caches every prompt block up to and including a block marked with
+# cache_control, so the static system prompts are only billed in full once. Prefixes
+# shorter than 1024 tokens are not cached, which today covers every prompt here, so
+# the marker only takes effect once a system prompt grows past that.
+EPHEMERAL = {"type": "ephemeral"}
+
+
+def cached_system_message(text: str) -> SystemMessage:
+    return SystemMessage(content=[{"type": "text", "text": text, "cache_control": EPHEMERAL}])
@@ -4,8 +4,10 @@ from typing import Optional
 
 from dotenv import load_dotenv
 from pydantic import BaseModel, Field
-from langchain_openai import ChatOpenAI
+from linkedin_news_post.llm_pool import llm
 from langchain_core.prompts import ChatPromptTemplate
+from linkedin_news_post.chains.prompt_cache import cached_system_message
+from linkedin_news_post.chains.history import trim_state
 
 # Load environment variables
 load_dotenv()
@@ -37,7 +39,6 @@ class LINKEDIN_CREATE_LINKED_IN_POST(BaseModel):
     params: LinkedinPostParams
 
 # Bind the tool to your LLM
-llm = ChatOpenAI(model="gpt-4o")
 llm_with_tools = llm.bind_tools([LINKEDIN_CREATE_LINKED_IN_POST])
 
 # Craft your system message: Note that we state the expected values for author,
@@ -53,10 +54,10 @@ system = (
 # Create the system prompt – note that we use a placeholder for additional messages
 systemPrompt = ChatPromptTemplate.from_messages(
     [
-        ("system", system),
+        cached_system_message(system),
         ("user", "Publish the text of the most recent article written by the writer_node and approved by the quality_node on LinkedIn. Use as the commentary the last article written by the writer_node.\n\n# Messages:\n\n{messages}"),
     ]
 )
 
 # Create the publisher chain using the system prompt with tools
-publisher_chain = systemPrompt | llm_with_tools
\ No newline at end of file
+publisher_chain = trim_state | systemPrompt | llm_with_tools
\ No newline at end of file
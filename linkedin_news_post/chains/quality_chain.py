@@ -1,9 +1,21 @@
 
 
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_openai import ChatOpenAI
+from langchain_core.runnables import RunnableLambda
+from linkedin_news_post.chains.prompt_cache import cached_system_message
+from linkedin_news_post.chains.history import trim_history
+from linkedin_news_post.llm_pool import llm
+
+from pydantic import BaseModel, Field
+from typing import Optional
+
+class QualityVerdict(BaseModel):
+    approved: bool = Field(description="Whether the new article is distinct enough from the past articles to publish")
+    reason: str = Field(description="Short explanation of the decision, e.g. \"Same SEBI update\"")
+    suggested_topic: Optional[str] = Field(default=None, description="A different topic for the researcher_node to explore when rejecting")
+
+structured_llm = llm.with_structured_output(QualityVerdict)
 
-llm =  ChatOpenAI(model="gpt-4o")
 
 system=""""
 # Content Detection Loop Prompt
@@ -31,10 +43,32 @@ You are an expert quality checker informing the supervisor if the writer’s new
 
 systemPrompt = ChatPromptTemplate.from_messages(
     [
-        ("system", system),
+        cached_system_message(system),
         ("user", "{messages}"),
         ("user", "Past Articles: \n\n {past_articles}")
     ]
 )
 
-quality_chain = systemPrompt | llm
\ No newline at end of file
+# Rough budget for the past articles, at ~4 characters per token
+MAX_PAST_ARTICLE_TOKENS = 1500
+
+def format_past_articles(past_articles) -> str:
+    """Render the distinct past articles that fit in the token budget."""
+    kept, seen = [], set()
+    budget = MAX_PAST_ARTICLE_TOKENS * 4
+    for item in past_articles:
+        text = str(getattr(item, "value", item))
+        if text in seen or len(text) > budget:
+            continue
+        seen.add(text)
+        kept.append(text)
+        budget -= len(text)
+    return "\n\n".join(kept)
+
+prepare_inputs = RunnableLambda(lambda state: {
+    **state,
+    "messages": trim_history(state["messages"]),
+    "past_articles": format_past_articles(state["past_articles"]),
+})
+
+quality_chain = prepare_inputs | systemPrompt | structured_llm
\ No newline at end of file
@@ -1,7 +1,9 @@
 from langgraph.prebuilt import create_react_agent
 
-from langchain_openai import ChatOpenAI
+from linkedin_news_post.llm_pool import llm
 from langchain_core.prompts import ChatPromptTemplate
+from linkedin_news_post.chains.prompt_cache import cached_system_message
+from linkedin_news_post.chains.history import trim_state
 from pydantic import BaseModel, Field
 
 from datetime import date
@@ -14,8 +16,6 @@ class search_and_content(BaseModel):
     start_published_date: str = Field(description="Start range of publishign range")
     end_published_date: str = Field(description="End range of publishign range")
 
-llm = ChatOpenAI(model="gpt-4o")
-
 llm_with_tools = llm.bind_tools([search_and_content])
 
 system = f"""You are an expert researcher tasked with finding the latest news in quantitative finance in the 1 to 3 months noting that today is {today} in the United States, tailored for advanced undergraduates seeking to apply for quant roles. 
@@ -26,14 +26,17 @@ If the supervisor provides you with information, always try a different query to
 """
 
 # Use placeholder instead of messages since we are working with create_react_agent
+# The per-call {instruction} is a closing human turn; templated content blocks lose their
+# cache_control, so the system prompt stays a literal message
 systemPrompt = ChatPromptTemplate.from_messages(
     [
-        ("system", system),
+        cached_system_message(system),
         ("placeholder", "{messages}"),
+        ("human", "{instruction}"),
     ]
 )
 
-researcher_chain = systemPrompt | llm_with_tools
+researcher_chain = trim_state | systemPrompt | llm_with_tools
 
 
 
@@ -1,11 +1,12 @@
 
-from langchain_openai import ChatOpenAI
+from linkedin_news_post.llm_pool import llm
 from langchain_core.prompts import ChatPromptTemplate
+from linkedin_news_post.chains.prompt_cache import cached_system_message
+from linkedin_news_post.chains.history import trim_state
 
 from pydantic import BaseModel, Field
 from typing import Literal
 
-llm = ChatOpenAI(model="gpt-4o")
 
 class Handout(BaseModel):
     next_node: Literal["researcher_node", "writer_node", "publisher_node", "quality_node", "end_node"] = Field(description="Next node in the workflow")
@@ -22,10 +23,10 @@ system = """You are a supervisor tasked with managing a conversation between the
 
 systemPrompt = ChatPromptTemplate.from_messages(
     [
-        ("system", system),
+        cached_system_message(system),
         ("user", "{messages}"),
     ]
 )
 
-supervisor_chain = systemPrompt | structured_llm
+supervisor_chain = trim_state | systemPrompt | structured_llm
 
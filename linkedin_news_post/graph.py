@@ -9,37 +9,16 @@ from linkedin_news_post.nodes import publisher_node, supervisor_node, researcher
 from contextlib import asynccontextmanager
 from langchain_mcp_adapters.client import MultiServerMCPClient
 
-from linkedin_news_post.mongo_store import MongoDBBaseStore
-from langchain_openai import OpenAIEmbeddings
+from linkedin_news_post.store import mongo_store
 
 from dotenv import load_dotenv
 
 load_dotenv()
 
 
-CONNECTION_STRING = os.environ["MONGODB_URI"]
 COMPOSIO_MCP_URL = os.environ["COMPOSIO_MCP_URL"]
 
 
-openai_embeddings = OpenAIEmbeddings()
-
-def embed_text(text: str) -> list[float]:
-    return openai_embeddings.embed_query(text)
-
-index_config = {
-    "embed": embed_text,     
-    "fields": ["content.article", "summary"],
-    "index_name": "store_index",
-}
-
-mongo_store = MongoDBBaseStore(
-    mongo_url=CONNECTION_STRING,   
-    db_name="checkpointing_db",                
-    collection_name="store",    
-    index_config=index_config,
-    ttl_support=True
-)
-
 @asynccontextmanager
 async def make_graph():
 
@@ -48,7 +27,8 @@ async def make_graph():
             "linkedin_tools_stdio": {
                 "transport": "stdio",
                 "command": "python",
-                "args": ["linkedin_news_post/mcp_server.py"],
+                # Run as a module so the server can import the shared store
+                "args": ["-m", "linkedin_news_post.mcp_server"],
             },
             "linkedin": {
                 "transport": "sse",
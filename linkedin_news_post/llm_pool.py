@@ -0,0 +1,8 @@
+from langchain_anthropic import ChatAnthropic
+
+# Seconds before a stalled request fails instead of holding a pooled connection
+LLM_REQUEST_TIMEOUT = 60.0
+
+# Shared by every chain: the model builds its Anthropic client, and with it the
+# keep-alive connection pool, once and reuses it for all chains
+llm = ChatAnthropic(model="claude-sonnet-4-20250514", default_request_timeout=LLM_REQUEST_TIMEOUT)
@@ -1,9 +1,15 @@
 import os 
 
+import pydantic_core
+from dotenv import load_dotenv
 from mcp.server.fastmcp import FastMCP
 from exa_py import Exa
 from typing import Annotated
-from datetime import date, timedelta, datetime
+from datetime import date, timedelta, datetime, timezone
+
+load_dotenv()
+
+from linkedin_news_post.store import mongo_store
 
 
 mcp = FastMCP("linkedin_tools_stdio")
@@ -11,9 +17,38 @@ EXA_API_KEY = os.environ["EXA_API_KEY"]
 
 exa = Exa(api_key=EXA_API_KEY)
 
+# Exa results are cached in the store and reused for the same query, or a near-identical
+# rewording of it. The threshold is a cosine: related but deliberately different queries
+# from the researcher's reject loop routinely score above 0.8 and must reach Exa.
+EXA_CACHE_NAMESPACE = ("exa_cache",)
+EXA_CACHE_TTL_MINUTES = 60 * 24
+EXA_CACHE_MIN_COSINE = 0.98
+
 
 start_published_date = datetime.combine(date.today() - timedelta(days=30), datetime.min.time()).isoformat() + ".000Z"
 
+
+def _cached_result(query: str, start_published_date: str, end_published_date: str):
+    hits = mongo_store.search(EXA_CACHE_NAMESPACE, query=query, limit=1)
+    if not hits:
+        return None
+    hit = hits[0]
+    created_at = hit.created_at
+    if created_at.tzinfo is None:
+        created_at = created_at.replace(tzinfo=timezone.utc)
+    fresh = created_at > datetime.now(timezone.utc) - timedelta(minutes=EXA_CACHE_TTL_MINUTES)
+    same_range = (
+        hit.value.get("start_published_date") == start_published_date
+        and hit.value.get("end_published_date") == end_published_date
+    )
+    # Atlas reports vectorSearchScore as (1 + cosine) / 2
+    cosine = 2 * (hit.score or 0) - 1
+    same_query = hit.value.get("query") == query or cosine >= EXA_CACHE_MIN_COSINE
+    if same_query and fresh and same_range:
+        return hit.value["result"]
+    return None
+
+
 @mcp.tool()
 def search_and_content(
     query: str,
@@ -21,8 +56,12 @@ def search_and_content(
     end_published_date: str
 ) -> str:
     """Search for webpages based on the query ... """
-    
-    return exa.search_and_contents(
+
+    cached = _cached_result(query, start_published_date, end_published_date)
+    if cached is not None:
+        return cached
+
+    response = exa.search_and_contents(
         query,
         use_autoprompt=False,
         num_results=10,
@@ -31,6 +70,24 @@ def search_and_content(
         text={"max_characters": 400},
         category="news",
     )
+    # Same JSON rendering FastMCP applies to non-string tool results
+    result = pydantic_core.to_json(response, fallback=str, indent=2).decode()
+
+    mongo_store.put(
+        EXA_CACHE_NAMESPACE,
+        key=query,
+        value={
+            "query": query,
+            "start_published_date": start_published_date,
+            "end_published_date": end_published_date,
+            "result": result,
+        },
+        index=["query"],
+        ttl=EXA_CACHE_TTL_MINUTES,
+    )
+    # This server process is stopped with the graph, so do not leave the entry buffered
+    mongo_store.flush()
+    return result
 
 
 if __name__ == "__main__":
@@ -0,0 +1,7 @@
+# One-off migration for stores written before documents carried namespace_str and
+# namespace_prefixes; run once with: python -m linkedin_news_post.migrate_namespace_fields
+from linkedin_news_post.store import mongo_store
+
+
+if __name__ == "__main__":
+    mongo_store.backfill_namespace_fields()
@@ -2,11 +2,17 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import math
 import pymongo
+import threading
 import uuid
+from bson import ObjectId
+from bson.binary import Binary, BinaryVectorDtype
+from motor.motor_asyncio import AsyncIOMotorClient
 from datetime import datetime, timedelta, timezone
-from functools import partial
-from typing import Optional, Dict, Any, Tuple, List, Union, Iterable
+from functools import lru_cache, partial, reduce
+from operator import itemgetter
+from typing import Optional, Dict, Any, Tuple, List, Union, Iterable, Callable
 
 # Imports from your store contract
 from langgraph.store.base import (
@@ -21,26 +27,34 @@ from langgraph.store.base import (
 )
 
 
-# Custom get_text_at_path that supports dot-notation
-def get_text_at_path(doc: dict, fields: List[str]) -> str:
-    """Extract text from a document following each field's dot-notation.
-    For example, if fields is ['content.article', 'summary'] and doc is
-    {'content': {'article': 'Hello world'}, 'summary': 'Greetings'},
-    then it returns 'Hello world Greetings'.
-    """
-    results = []
-    for field in fields:
-        parts = field.split(".")
-        current = doc
-        for part in parts:
-            if isinstance(current, dict) and part in current:
-                current = current[part]
-            else:
-                current = None
-                break
+def _build_getter(parts: List[str]) -> Callable[[Any], Optional[str]]:
+    """Compile one dot-notation field into a getter returning its stripped text, or None."""
+    getters = [itemgetter(part) for part in parts]
+
+    def get(doc: Any) -> Optional[str]:
+        try:
+            current = reduce(lambda obj, getter: getter(obj), getters, doc)
+        except (KeyError, IndexError, TypeError):
+            return None
         if isinstance(current, str) and current.strip():
-            results.append(current.strip())
-    return " ".join(results)
+            return current.strip()
+        return None
+
+    return get
+
+
+@lru_cache(maxsize=64)
+def compile_text_extractors(fields: Tuple[str, ...]) -> Tuple[Callable[[Any], Optional[str]], ...]:
+    """Compile the fields to embed once, instead of walking each path on every put.
+    For example, with fields ('content.article', 'summary') and doc
+    {'content': {'article': 'Hello world'}, 'summary': 'Greetings'}, the
+    extractors yield 'Hello world' and 'Greetings'.
+    """
+    return tuple(_build_getter(field.split(".")) for field in fields)
+
+
+def extract_text(doc: dict, extractors: Tuple[Callable[[Any], Optional[str]], ...]) -> str:
+    return " ".join(text for text in (extract(doc) for extract in extractors) if text)
 
 
 # Sentinel for a value that is "not provided"
@@ -51,35 +65,151 @@ class _NotProvidedSentinel:
 NOT_PROVIDED: _NotProvidedSentinel = _NotProvidedSentinel()
 
 
+def _unit_vector(vector: List[float]) -> List[float]:
+    """Scale a vector to unit length, so a dot product with another unit vector is their cosine."""
+    norm = math.hypot(*vector)
+    return [x / norm for x in vector] if norm else list(vector)
+
+
+def _pack_vector(vector: List[float]) -> Binary:
+    """Store an embedding as a unit-length float32 BinData vector, half the size of a BSON double array."""
+    return Binary.from_vector(_unit_vector(vector), BinaryVectorDtype.FLOAT32)
+
+
+def _raise_unless_duplicates(error: pymongo.errors.BulkWriteError) -> None:
+    """Ignore a bulk insert that only failed on documents an earlier flush already wrote."""
+    if any(err.get("code") != 11000 for err in error.details.get("writeErrors", [])):
+        raise error
+    if error.details.get("writeConcernErrors"):
+        raise error
+
+
+def _namespace_str(namespace: Tuple[str, ...]) -> str:
+    """Join a namespace into a single string, e.g. ("a", "b") -> "a/b/"."""
+    return "".join(f"{part}/" for part in namespace)
+
+
+def _namespace_prefix_query(namespace_prefix: Tuple[str, ...]) -> Dict[str, Any]:
+    if not namespace_prefix:
+        return {}
+    # namespace_str always ends with "/", so a prefix is an indexed range scan
+    # up to the next character after the separator
+    p = _namespace_str(namespace_prefix)
+    return {"namespace_str": {"$gte": p, "$lt": p[:-1] + "0"}}
+
+
+def _filter_items(filter: Dict[str, Any]) -> Tuple[Tuple[str, type, Any], ...]:
+    # The value's type is part of the key: True == 1 == 1.0 in Python, but Mongo does not
+    # match a boolean against a number, so those filters must not share a cached dict
+    return tuple((k, type(v), v) for k, v in sorted(filter.items(), key=itemgetter(0)))
+
+
+def _frozen_filter(filter: Optional[Dict[str, Any]]) -> Optional[Tuple[Tuple[str, type, Any], ...]]:
+    """Hashable form of a search filter, or None if a value is unhashable (e.g. a list)."""
+    items = _filter_items(filter or {})
+    try:
+        hash(items)
+    except TypeError:
+        return None
+    return items
+
+
+# The builders below are memoised on (namespace_prefix, filter items), so repeated searches
+# reuse the same filter dict. Callers must treat the returned dicts as read-only.
+@lru_cache(maxsize=256)
+def _build_search_filter(
+    namespace_prefix: Tuple[str, ...], filter_items: Tuple[Tuple[str, type, Any], ...]
+) -> Dict[str, Any]:
+    q = _namespace_prefix_query(namespace_prefix)
+    for k, _, v in filter_items:
+        q[f"value.{k}"] = v
+    return q
+
+
+@lru_cache(maxsize=256)
+def _build_vector_filter(
+    namespace_prefix: Tuple[str, ...], filter_items: Tuple[Tuple[str, type, Any], ...]
+) -> Optional[Dict[str, Any]]:
+    conditions: List[Dict[str, Any]] = []
+    if namespace_prefix:
+        conditions.append({"namespace_prefixes": "/".join(namespace_prefix)})
+    for k, _, v in filter_items:
+        conditions.append({f"value.{k}": v})
+    if not conditions:
+        return None
+    return conditions[0] if len(conditions) == 1 else {"$and": conditions}
+
+
+def _to_search_item(doc: Dict[str, Any]) -> SearchItem:
+    return SearchItem(
+        namespace=tuple(doc["namespace"]),
+        key=doc.get("logical_key", doc["key"]),
+        value=doc["value"],
+        created_at=doc.get("created"),
+        updated_at=doc.get("created"),
+        score=doc.get("score"),
+    )
+
+
 class MongoDBBaseStore(BaseStore):
     """
     MongoDB-based persistent store that supports both standard (text)
     search and semantic (vector) search.
 
     When an index configuration is provided (including an 'embed'
-    embedding function), the store computes and stores embeddings during put() operations,
-    then uses a knnBeta aggregation stage for search().
+    embedding function), the store computes and stores embeddings during put() operations
+    (through the optional 'embed_batch' function for several documents at once),
+    then uses a single $vectorSearch aggregation stage for search(). The namespace prefix and
+    any value filters are pushed down into the stage's filter, so non-matching vectors are
+    never scored.
 
-    IMPORTANT: Your Atlas Search index must be configured so that the "embedding" field is mapped as a knnVector.
-    For example, in Atlas use a mapping similar to:
+    IMPORTANT: Your Atlas index must be a "vectorSearch" index with "embedding" mapped as a
+    vector and "namespace_prefixes" as a filter field. For example:
 
       {
-        "mappings": {
-          "dynamic": false,
-          "fields": {
-            "embedding": {
-              "type": "knnVector",
-              "dimensions": 1536,
-              "similarity": "cosine"
-            }
+        "fields": [
+          {
+            "type": "vector",
+            "path": "embedding",
+            "numDimensions": 1536,
+            "similarity": "dotProduct",
+            "quantization": "scalar"
+          },
+          {
+            "type": "filter",
+            "path": "namespace_prefixes"
           }
-        }
+        ]
       }
 
+    Any "value.<field>" used in a search filter must also be added as a filter field.
+
+    Embeddings are normalised to unit length when stored, and query vectors when searched, so
+    the index can use "dotProduct" similarity: it equals cosine here without Atlas dividing by
+    the vector norms on every comparison. Embeddings are stored as float32 BinData vectors; with
+    "quantization": "scalar" Atlas builds the HNSW graph from int8 copies of them, a quarter of
+    the float32 memory.
+
+    Atlas builds this index as an HNSW graph, so $vectorSearch is an approximate
+    nearest-neighbour lookup rather than a scan of the collection. "num_candidates_multiplier"
+    in index_config (default 10) sets how many graph candidates are explored per result
+    returned: raise it for recall, lower it for latency.
+
     Also ensure that the "index_name" in your index_config (e.g., "store_index") matches the Atlas index.
     
     Note: The search() operation is read-only; inserted documents are not updated by search,
     and Atlas Search indexes are updated asynchronously.
+
+    The async methods use a Motor client and await the driver directly; embeddings use the
+    optional 'aembed' / 'aembed_batch' coroutines and fall back to the sync functions in a
+    thread.
+
+    Consecutive puts in a batch() are written with a single insert_many. With fast_insert=True
+    puts are buffered before embedding; once flush_size documents are pending, on flush(), or
+    before the next read they are embedded with one batched call and written with one
+    insert_many. Documents stay buffered until that insert succeeds, so a failed or cancelled
+    flush is retried by the next one. Flushes are acknowledged unless unacked_flush=True, which
+    suits stores holding only best-effort data such as caches.
     """
 
     def __init__(
@@ -89,16 +219,39 @@ class MongoDBBaseStore(BaseStore):
         collection_name: str = "store",
         ttl_support: bool = False,
         index_config: Optional[Dict[str, Any]] = None,
+        fast_insert: bool = False,
+        flush_size: int = 100,
+        unacked_flush: bool = False,
     ):
         self._client = pymongo.MongoClient(mongo_url)
         self._db = self._client[db_name]
         self._collection = self._db[collection_name]
+        # Motor client backing the async methods, so they run on the event loop
+        self._aclient = AsyncIOMotorClient(mongo_url)
+        self._acollection = self._aclient[db_name][collection_name]
         self._ttl_support = ttl_support
         self.supports_ttl = ttl_support
 
+        self._fast_insert = fast_insert
+        self._flush_size = flush_size
+        # Built (document, text to embed) pairs; embedded together when flushed
+        self._pending_docs: List[Tuple[Dict[str, Any], str]] = []
+        # One flush at a time, so a concurrent caller waits for the write in progress
+        self._flush_lock = threading.Lock()
+        self._aflush_lock = asyncio.Lock()
+        self._unacked_flush = unacked_flush
+        self._unacked_collection = self._collection.with_options(
+            write_concern=pymongo.WriteConcern(w=0)
+        )
+        self._aunacked_collection = self._acollection.with_options(
+            write_concern=pymongo.WriteConcern(w=0)
+        )
+
         if ttl_support:
             self._collection.create_index("expiration", expireAfterSeconds=0)
 
+        self._collection.create_index("namespace_str")
+
         # Create a text index on "value" for fallback queries
         self._collection.create_index([("value", "text")], name="value_text_index")
 
@@ -106,26 +259,165 @@ class MongoDBBaseStore(BaseStore):
         if index_config and "embed" in index_config:
             self.semantic_enabled = True
             self._embedding_fn = index_config["embed"]
+            self._embed_batch_fn = index_config.get("embed_batch")
+            self._aembedding_fn = index_config.get("aembed")
+            self._aembed_batch_fn = index_config.get("aembed_batch")
             self.index_name = index_config.get("index_name", "langchain_vsearch_index")
+            self._num_candidates_multiplier = index_config.get("num_candidates_multiplier", 10)
+            # Default to ["$"] if no fields are configured
+            self._extractors = compile_text_extractors(tuple(index_config.get("fields", ["$"])))
         else:
             self.semantic_enabled = False
             self._embedding_fn = None
+            self._embed_batch_fn = None
+            self._aembedding_fn = None
+            self._aembed_batch_fn = None
             self.index_name = None
+            self._num_candidates_multiplier = 10
+            self._extractors = ()
+
+    def backfill_namespace_fields(self) -> None:
+        """Add the derived namespace fields to documents written before they existed.
+
+        Namespaced $vectorSearch filters on "namespace_prefixes" and text search and
+        list_namespaces match prefixes on "namespace_str", so documents without them would
+        never match. This scans the collection, so it is a one-off migration
+        (linkedin_news_post.migrate_namespace_fields) rather than part of startup; only
+        documents still missing a field are touched, so running it again is harmless.
+        """
+        joined_prefix = {
+            "$reduce": {
+                "input": {"$slice": ["$namespace", "$$n"]},
+                "initialValue": "",
+                "in": {
+                    "$cond": [
+                        {"$eq": ["$$value", ""]},
+                        "$$this",
+                        {"$concat": ["$$value", "/", "$$this"]},
+                    ]
+                },
+            }
+        }
+        result = self._collection.update_many(
+            {"namespace_prefixes": {"$exists": False}},
+            [
+                {
+                    "$set": {
+                        "namespace_prefixes": {
+                            "$map": {
+                                "input": {"$range": [1, {"$add": [{"$size": "$namespace"}, 1]}]},
+                                "as": "n",
+                                "in": joined_prefix,
+                            }
+                        }
+                    }
+                }
+            ],
+        )
+        if result.modified_count:
+            logging.info("Backfilled namespace_prefixes on %d documents", result.modified_count)
+
+        result = self._collection.update_many(
+            {"namespace_str": {"$exists": False}},
+            [
+                {
+                    "$set": {
+                        "namespace_str": {
+                            "$reduce": {
+                                "input": "$namespace",
+                                "initialValue": "",
+                                "in": {"$concat": ["$$value", "$$this", "/"]},
+                            }
+                        }
+                    }
+                }
+            ],
+        )
+        if result.modified_count:
+            logging.info("Backfilled namespace_str on %d documents", result.modified_count)
 
     def _namespace_query(self, namespace: Tuple[str, ...]) -> Dict[str, Any]:
         return {"namespace": list(namespace)}
 
     def _namespace_prefix_query(self, namespace_prefix: Tuple[str, ...]) -> Dict[str, Any]:
-        query: Dict[str, Any] = {}
-        for i, part in enumerate(namespace_prefix):
-            query[f"namespace.{i}"] = part
-        return query
+        return _namespace_prefix_query(namespace_prefix)
+
+    def _search_filter(
+        self, namespace_prefix: Tuple[str, ...], filter: Optional[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        items = _frozen_filter(filter)
+        if items is None:
+            return _build_search_filter.__wrapped__(tuple(namespace_prefix), _filter_items(filter))
+        return _build_search_filter(tuple(namespace_prefix), items)
 
     def _compute_expiration(self, ttl: Optional[float]) -> Optional[datetime]:
         if ttl is None:
             return None
         return datetime.now(timezone.utc) + timedelta(minutes=ttl)
 
+    def _refresh_ttl_update(self) -> List[Dict[str, Any]]:
+        """Pipeline update that extends the expiration only of documents that have one."""
+        new_exp = self._compute_expiration(10)
+        return [
+            {
+                "$set": {
+                    "expiration": {
+                        "$cond": [{"$ifNull": ["$expiration", False]}, new_exp, "$expiration"]
+                    }
+                }
+            }
+        ]
+
+    def _ttl_refresh_ops(self, docs: List[Dict[str, Any]]) -> List[pymongo.UpdateOne]:
+        """Extend the expiration of search hits; sent as one best-effort bulk_write."""
+        if not self._ttl_support:
+            return []
+        new_exp = self._compute_expiration(10)
+        ops = []
+        for doc in docs:
+            if doc.get("expiration"):
+                ops.append(pymongo.UpdateOne({"_id": doc["_id"]}, {"$set": {"expiration": new_exp}}))
+                doc["expiration"] = new_exp
+        return ops
+
+    def _put_docs(self, built: List[Tuple[Dict[str, Any], str]]) -> None:
+        if not built:
+            return
+        if self._fast_insert:
+            self._pending_docs.extend(built)
+            if len(self._pending_docs) >= self._flush_size:
+                self.flush()
+            return
+        self._insert_docs(self._embed_docs(built))
+
+    def _insert_docs(self, docs: List[Dict[str, Any]]) -> None:
+        if not docs:
+            return
+        if len(docs) == 1:
+            self._collection.insert_one(docs[0])
+        else:
+            self._collection.insert_many(docs, ordered=False)
+        logging.info("Inserted %d documents into collection", len(docs))
+
+    def _flush_collection(self, collection: Any, unacked_collection: Any) -> Any:
+        return unacked_collection if self._unacked_flush else collection
+
+    def flush(self) -> None:
+        """Embed documents buffered by fast_insert puts in one batch and write them out."""
+        with self._flush_lock:
+            if not self._pending_docs:
+                return
+            # Copied, not taken: the documents leave the buffer only once they are written
+            built = list(self._pending_docs)
+            docs = self._embed_docs(built)
+            collection = self._flush_collection(self._collection, self._unacked_collection)
+            try:
+                collection.insert_many(docs, ordered=False)
+            except pymongo.errors.BulkWriteError as e:
+                _raise_unless_duplicates(e)
+            del self._pending_docs[:len(built)]
+            logging.info("Flushed %d buffered documents into collection", len(docs))
+
     # Synchronous Methods
     def get(
         self,
@@ -134,14 +426,16 @@ class MongoDBBaseStore(BaseStore):
         *,
         refresh_ttl: Optional[bool] = None,
     ) -> Optional[Item]:
+        self.flush()
         q = {**self._namespace_query(namespace), "key": key}
-        doc = self._collection.find_one(q)
+        if refresh_ttl and self._ttl_support:
+            doc = self._collection.find_one_and_update(
+                q, self._refresh_ttl_update(), return_document=pymongo.ReturnDocument.AFTER
+            )
+        else:
+            doc = self._collection.find_one(q)
         if doc is None:
             return None
-        if refresh_ttl and self._ttl_support and doc.get("expiration"):
-            new_exp = self._compute_expiration(10)
-            self._collection.update_one(q, {"$set": {"expiration": new_exp}})
-            doc["expiration"] = new_exp
         return Item(
             value=doc["value"],
             key=doc.get("logical_key", doc["key"]),
@@ -150,6 +444,68 @@ class MongoDBBaseStore(BaseStore):
             updated_at=doc.get("created"),
         )
 
+    def _vector_filter(
+        self, namespace_prefix: Tuple[str, ...], filter: Optional[Dict[str, Any]]
+    ) -> Optional[Dict[str, Any]]:
+        items = _frozen_filter(filter)
+        if items is None:
+            return _build_vector_filter.__wrapped__(tuple(namespace_prefix), _filter_items(filter))
+        return _build_vector_filter(tuple(namespace_prefix), items)
+
+    def _semantic_pipeline(
+        self,
+        query_vector: List[float],
+        namespace_prefix: Tuple[str, ...],
+        filter: Optional[Dict[str, Any]],
+        limit: int,
+        offset: int,
+    ) -> List[Dict[str, Any]]:
+        # Oversample candidates so the filtered top results are found without a fallback query
+        vector_search: Dict[str, Any] = {
+            "index": self.index_name,
+            "path": "embedding",
+            "queryVector": _unit_vector(query_vector),
+            "numCandidates": min((offset + limit) * self._num_candidates_multiplier, 10000),
+            "limit": offset + limit,
+        }
+        vector_filter = self._vector_filter(namespace_prefix, filter)
+        if vector_filter:
+            vector_search["filter"] = vector_filter
+        return [
+            {"$vectorSearch": vector_search},
+            {"$skip": offset},
+            {
+                "$project": {
+                    "namespace": 1,
+                    "key": 1,
+                    "value": 1,
+                    "created": 1,
+                    "expiration": 1,
+                    "score": {"$meta": "vectorSearchScore"},
+                }
+            },
+        ]
+
+    def _text_query(
+        self,
+        namespace_prefix: Tuple[str, ...],
+        filter: Optional[Dict[str, Any]],
+        query: Optional[str],
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        q = self._search_filter(namespace_prefix, filter)
+        if query:
+            q = {**q, "$text": {"$search": query}}
+        projection: Dict[str, Any] = {
+            "namespace": 1,
+            "key": 1,
+            "value": 1,
+            "created": 1,
+            "expiration": 1,
+        }
+        if query:
+            projection["score"] = {"$meta": "textScore"}
+        return q, projection
+
     def search(
         self,
         namespace_prefix: Tuple[str, ...],
@@ -159,137 +515,34 @@ class MongoDBBaseStore(BaseStore):
         limit: int = 10,
         offset: int = 0,
         refresh_ttl: Optional[bool] = None,
+        query_vector: Optional[List[float]] = None,
     ) -> List[SearchItem]:
-        results: List[SearchItem] = []
+        self.flush()
         if self.semantic_enabled:
-            # Always use semantic (vector) search when enabled
-            query_vector = self._embedding_fn(query or "")
-            search_stage = {
-                "$search": {
-                    "index": self.index_name,
-                    "knnBeta": {
-                        "vector": query_vector,
-                        "path": "embedding",
-                        "k": limit,
-                    },
-                }
-            }
-            pipeline: List[Dict[str, Any]] = [search_stage]
-            ns_filter = self._namespace_prefix_query(namespace_prefix)
-            if filter:
-                for k, v in filter.items():
-                    ns_filter[f"value.{k}"] = v
-            if ns_filter:
-                pipeline.append({"$match": ns_filter})
-            pipeline.append({"$sort": {"score": -1}})
-            pipeline.extend(
-                [
-                    {"$skip": offset},
-                    {"$limit": limit},
-                    {
-                        "$project": {
-                            "namespace": 1,
-                            "key": 1,
-                            "value": 1,
-                            "created": 1,
-                            "score": {"$meta": "searchScore"},
-                        }
-                    },
-                ]
-            )
+            # Always use semantic (vector) search when enabled; callers that already
+            # embedded the query pass query_vector to skip embedding it again
+            if query_vector is None:
+                query_vector = self._embedding_fn(query or "")
+            pipeline = self._semantic_pipeline(query_vector, namespace_prefix, filter, limit, offset)
             try:
                 cursor = self._collection.aggregate(pipeline)
                 docs = list(cursor)
             except pymongo.errors.OperationFailure as e:
                 logging.error("Error running semantic search: %s", e)
                 docs = []
-            seen_keys = set()
-            for doc in docs:
-                if refresh_ttl and self._ttl_support and doc.get("expiration"):
-                    new_exp = self._compute_expiration(10)
-                    self._collection.update_one(
-                        {"_id": doc["_id"]}, {"$set": {"expiration": new_exp}}
-                    )
-                    doc["expiration"] = new_exp
-                item = SearchItem(
-                    namespace=tuple(doc["namespace"]),
-                    key=doc.get("logical_key", doc["key"]),
-                    value=doc["value"],
-                    created_at=doc.get("created"),
-                    updated_at=doc.get("created"),
-                    score=doc.get("score"),
-                )
-                results.append(item)
-                seen_keys.add(doc.get("logical_key", doc["key"]))
-            # Optionally, if fewer documents returned than limit, fill with fallback text search
-            if len(results) < limit:
-                remaining = limit - len(results)
-                fallback_q = self._namespace_prefix_query(namespace_prefix)
-                if filter:
-                    for k, v in filter.items():
-                        fallback_q[f"value.{k}"] = v
-                if query:
-                    fallback_q["$text"] = {"$search": query}
-                projection: Dict[str, Any] = {
-                    "namespace": 1,
-                    "key": 1,
-                    "value": 1,
-                    "created": 1,
-                }
-                if query:
-                    projection["score"] = {"$meta": "textScore"}
-                fallback_cursor = (
-                    self._collection.find(fallback_q, projection=projection)
-                    .sort([("score", {"$meta": "textScore"})])
-                    .skip(offset)
-                    .limit(remaining)
-                )
-                for doc in fallback_cursor:
-                    key_val = doc.get("logical_key", doc["key"])
-                    if key_val in seen_keys:
-                        continue
-                    item = SearchItem(
-                        namespace=tuple(doc["namespace"]),
-                        key=doc.get("logical_key", doc["key"]),
-                        value=doc["value"],
-                        created_at=doc.get("created"),
-                        updated_at=doc.get("created"),
-                        score=doc.get("score"),
-                    )
-                    results.append(item)
-                    seen_keys.add(key_val)
-                    if len(results) >= limit:
-                        break
-            return results
         else:
             # Fallback: basic text search when semantic search is disabled
-            q = self._namespace_prefix_query(namespace_prefix)
-            if filter:
-                for k, v in filter.items():
-                    q[f"value.{k}"] = v
-            if query:
-                q["$text"] = {"$search": query}
-            projection: Dict[str, Any] = {"namespace": 1, "key": 1, "value": 1, "created": 1}
-            if query:
-                projection["score"] = {"$meta": "textScore"}
-            cursor = (
+            q, projection = self._text_query(namespace_prefix, filter, query)
+            docs = list(
                 self._collection.find(q, projection=projection)
                 .sort([("score", {"$meta": "textScore"})])
                 .skip(offset)
                 .limit(limit)
             )
-            for doc in cursor:
-                results.append(
-                    SearchItem(
-                        namespace=tuple(doc["namespace"]),
-                        key=doc.get("logical_key", doc["key"]),
-                        value=doc["value"],
-                        created_at=doc.get("created"),
-                        updated_at=doc.get("created"),
-                        score=doc.get("score"),
-                    )
-                )
-            return results
+        ttl_ops = self._ttl_refresh_ops(docs) if refresh_ttl else []
+        if ttl_ops:
+            self._unacked_collection.bulk_write(ttl_ops, ordered=False)
+        return [_to_search_item(doc) for doc in docs]
 
     def put(
         self,
@@ -300,10 +553,26 @@ class MongoDBBaseStore(BaseStore):
         *,
         ttl: Union[Optional[float], _NotProvidedSentinel] = NOT_PROVIDED,
     ) -> None:
+        self._put_docs([self._build_doc(namespace, key, value, index, ttl)])
+
+    def _build_doc(
+        self,
+        namespace: Tuple[str, ...],
+        key: str,
+        value: Dict[str, Any],
+        index: Optional[Union[bool, List[str]]],
+        ttl: Union[Optional[float], _NotProvidedSentinel],
+    ) -> Tuple[Dict[str, Any], str]:
+        """Build the document for a put, along with the text to embed ("" for none)."""
         unique_key = str(uuid.uuid4())
         now = datetime.now(timezone.utc)
         doc: Dict[str, Any] = {
+            # Set up front so re-inserting a document after a failed flush is a duplicate key
+            "_id": ObjectId(),
             "namespace": list(namespace),
+            "namespace_str": _namespace_str(namespace),
+            # Every joined prefix of the namespace, for equality filters inside $vectorSearch
+            "namespace_prefixes": ["/".join(namespace[: i + 1]) for i in range(len(namespace))],
             "key": unique_key,
             "logical_key": key,
             "value": value,
@@ -314,27 +583,41 @@ class MongoDBBaseStore(BaseStore):
         if index is not None:
             doc["indexed"] = index
 
-        # When semantic search is enabled, extract text and compute embedding
+        # When semantic search is enabled, extract the text to embed
+        text = ""
         if index is not False and self.semantic_enabled:
-            # Get the fields from config; default to ["$"] if not provided
-            fields: List[str] = (
-                self._index_config.get("fields", ["$"]) if self._index_config else ["$"]
+            # Fields passed to put() win over the ones compiled from the config
+            extractors = (
+                compile_text_extractors(tuple(index))
+                if isinstance(index, list)
+                else self._extractors
             )
-            text = get_text_at_path(value, fields)
-            logging.info("Extracted text for embedding using fields %s: %s", fields, text)
-            if text.strip():
-                embedding_vector = self._embedding_fn(text)
-                logging.info("Created embedding vector of length %d", len(embedding_vector))
-                doc["embedding"] = embedding_vector
-            else:
+            text = extract_text(value, extractors)
+            logging.debug("Extracted text for embedding: %s", text)
+            if not text.strip():
                 logging.warning(
                     "No text extracted for embedding; document will not have an embedding."
                 )
 
-        self._collection.insert_one(doc)
-        logging.info("Inserted document with key %s into collection", unique_key)
+        return doc, text
+
+    def _embed_docs(self, built: List[Tuple[Dict[str, Any], str]]) -> List[Dict[str, Any]]:
+        """Attach embeddings to built documents, using one batched request when possible."""
+        # Documents kept buffered after a failed flush already carry their embedding
+        to_embed = [(doc, text) for doc, text in built if text.strip() and "embedding" not in doc]
+        if to_embed:
+            texts = [text for _, text in to_embed]
+            if self._embed_batch_fn is not None:
+                vectors = self._embed_batch_fn(texts)
+            else:
+                vectors = [self._embedding_fn(text) for text in texts]
+            for (doc, _), vector in zip(to_embed, vectors):
+                doc["embedding"] = _pack_vector(vector)
+            logging.info("Created %d embedding vectors", len(vectors))
+        return [doc for doc, _ in built]
 
     def delete(self, namespace: Tuple[str, ...], key: str) -> None:
+        self.flush()
         q = {**self._namespace_query(namespace), "key": key}
         self._collection.delete_one(q)
 
@@ -347,25 +630,63 @@ class MongoDBBaseStore(BaseStore):
         limit: int = 100,
         offset: int = 0,
     ) -> List[Tuple[str, ...]]:
-        q: Dict[str, Any] = {}
+        self.flush()
+        pipeline = self._list_namespaces_pipeline(prefix, suffix, max_depth, limit, offset)
+        return [tuple(doc["_id"]) for doc in self._collection.aggregate(pipeline)]
+
+    def _list_namespaces_pipeline(
+        self,
+        prefix: Optional[Tuple[str, ...]],
+        suffix: Optional[Tuple[str, ...]],
+        max_depth: Optional[int],
+        limit: int,
+        offset: int,
+    ) -> List[Dict[str, Any]]:
+        pipeline: List[Dict[str, Any]] = []
         if prefix:
-            q.update(self._namespace_prefix_query(prefix))
-        namespaces = self._collection.distinct("namespace", q)
+            pipeline.append({"$match": self._search_filter(prefix, None)})
         if suffix:
-            def matches_suffix(ns: List[str]) -> bool:
-                return (
-                    tuple(ns[-len(suffix) :]) == suffix if len(ns) >= len(suffix) else False
-                )
-
-            namespaces = [ns for ns in namespaces if matches_suffix(ns)]
-        if max_depth is not None:
-            namespaces = [ns[:max_depth] for ns in namespaces]
-        unique_namespaces = sorted({tuple(ns) for ns in namespaces})
-        return unique_namespaces[offset : offset + limit]
+            pipeline.append(
+                {"$match": {"$expr": {"$eq": [{"$slice": ["$namespace", -len(suffix)]}, list(suffix)]}}}
+            )
+        ns = {"$slice": ["$namespace", max_depth]} if max_depth is not None else "$namespace"
+        pipeline.extend(
+            [
+                {"$group": {"_id": ns}},
+                # Mongo sorts arrays by their smallest element, so sort on the joined
+                # parts to get the same order as sorting tuples
+                {
+                    "$addFields": {
+                        "sort_key": {
+                            "$reduce": {
+                                "input": "$_id",
+                                "initialValue": "",
+                                "in": {"$concat": ["$$value", "\u0001", "$$this"]},
+                            }
+                        }
+                    }
+                },
+                {"$sort": {"sort_key": 1}},
+                {"$skip": offset},
+                {"$limit": limit},
+            ]
+        )
+        return pipeline
 
     def batch(self, ops: Iterable[Any]) -> List[Any]:
         results = []
+        # Contiguous puts are collected, embedded together and written with one insert_many
+        put_docs: List[Tuple[Dict[str, Any], str]] = []
         for op in ops:
+            if isinstance(op, PutOp) and op.value is not None:
+                put_docs.append(
+                    self._build_doc(op.namespace, op.key, op.value, op.index, op.ttl)
+                )
+                results.append(None)
+                continue
+            if put_docs:
+                self._put_docs(put_docs)
+                put_docs = []
             if isinstance(op, GetOp):
                 res = self.get(op.namespace, op.key, refresh_ttl=op.refresh_ttl)
             elif isinstance(op, SearchOp):
@@ -378,10 +699,7 @@ class MongoDBBaseStore(BaseStore):
                     refresh_ttl=op.refresh_ttl,
                 )
             elif isinstance(op, PutOp):
-                if op.value is not None:
-                    res = self.put(op.namespace, op.key, op.value, index=op.index, ttl=op.ttl)
-                else:
-                    res = self.delete(op.namespace, op.key)
+                res = self.delete(op.namespace, op.key)
             elif isinstance(op, ListNamespacesOp):
                 prefix = None
                 suffix = None
@@ -401,11 +719,111 @@ class MongoDBBaseStore(BaseStore):
             else:
                 res = None
             results.append(res)
+        self._put_docs(put_docs)
         return results
 
-    async def abatch(self, ops: Iterable[Any]) -> List[Any]:
+    # Asynchronous Methods (native Motor coroutines)
+    async def _aembed_docs(
+        self, built: List[Tuple[Dict[str, Any], str]]
+    ) -> List[Dict[str, Any]]:
+        if self._aembed_batch_fn is None:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, partial(self._embed_docs, built))
+        # Documents kept buffered after a failed flush already carry their embedding
+        to_embed = [(doc, text) for doc, text in built if text.strip() and "embedding" not in doc]
+        if to_embed:
+            vectors = await self._aembed_batch_fn([text for _, text in to_embed])
+            for (doc, _), vector in zip(to_embed, vectors):
+                doc["embedding"] = _pack_vector(vector)
+            logging.info("Created %d embedding vectors", len(vectors))
+        return [doc for doc, _ in built]
+
+    async def _aembed_query(self, text: str) -> List[float]:
+        if self._aembedding_fn is not None:
+            return await self._aembedding_fn(text)
         loop = asyncio.get_running_loop()
-        return await loop.run_in_executor(None, partial(self.batch, ops))
+        return await loop.run_in_executor(None, partial(self._embedding_fn, text))
+
+    async def _aput_docs(self, built: List[Tuple[Dict[str, Any], str]]) -> None:
+        if not built:
+            return
+        if self._fast_insert:
+            self._pending_docs.extend(built)
+            if len(self._pending_docs) >= self._flush_size:
+                await self.aflush()
+            return
+        await self._ainsert_docs(await self._aembed_docs(built))
+
+    async def _ainsert_docs(self, docs: List[Dict[str, Any]]) -> None:
+        if not docs:
+            return
+        if len(docs) == 1:
+            await self._acollection.insert_one(docs[0])
+        else:
+            await self._acollection.insert_many(docs, ordered=False)
+        logging.info("Inserted %d documents into collection", len(docs))
+
+    async def aflush(self) -> None:
+        async with self._aflush_lock:
+            if not self._pending_docs:
+                return
+            built = list(self._pending_docs)
+            docs = await self._aembed_docs(built)
+            collection = self._flush_collection(self._acollection, self._aunacked_collection)
+            try:
+                await collection.insert_many(docs, ordered=False)
+            except pymongo.errors.BulkWriteError as e:
+                _raise_unless_duplicates(e)
+            del self._pending_docs[:len(built)]
+            logging.info("Flushed %d buffered documents into collection", len(docs))
+
+    async def abatch(self, ops: Iterable[Any]) -> List[Any]:
+        results = []
+        put_docs: List[Tuple[Dict[str, Any], str]] = []
+        for op in ops:
+            if isinstance(op, PutOp) and op.value is not None:
+                put_docs.append(
+                    self._build_doc(op.namespace, op.key, op.value, op.index, op.ttl)
+                )
+                results.append(None)
+                continue
+            if put_docs:
+                await self._aput_docs(put_docs)
+                put_docs = []
+            if isinstance(op, GetOp):
+                res = await self.aget(op.namespace, op.key, refresh_ttl=op.refresh_ttl)
+            elif isinstance(op, SearchOp):
+                res = await self.asearch(
+                    op.namespace_prefix,
+                    query=op.query,
+                    filter=op.filter,
+                    limit=op.limit,
+                    offset=op.offset,
+                    refresh_ttl=op.refresh_ttl,
+                )
+            elif isinstance(op, PutOp):
+                res = await self.adelete(op.namespace, op.key)
+            elif isinstance(op, ListNamespacesOp):
+                prefix = None
+                suffix = None
+                if op.match_conditions:
+                    for cond in op.match_conditions:
+                        if cond.match_type == "prefix":
+                            prefix = cond.path
+                        elif cond.match_type == "suffix":
+                            suffix = cond.path
+                res = await self.alist_namespaces(
+                    prefix=prefix,
+                    suffix=suffix,
+                    max_depth=op.max_depth,
+                    limit=op.limit,
+                    offset=op.offset,
+                )
+            else:
+                res = None
+            results.append(res)
+        await self._aput_docs(put_docs)
+        return results
 
     async def aget(
         self,
@@ -414,9 +832,22 @@ class MongoDBBaseStore(BaseStore):
         *,
         refresh_ttl: Optional[bool] = None,
     ) -> Optional[Item]:
-        loop = asyncio.get_running_loop()
-        return await loop.run_in_executor(
-            None, partial(self.get, namespace, key, refresh_ttl=refresh_ttl)
+        await self.aflush()
+        q = {**self._namespace_query(namespace), "key": key}
+        if refresh_ttl and self._ttl_support:
+            doc = await self._acollection.find_one_and_update(
+                q, self._refresh_ttl_update(), return_document=pymongo.ReturnDocument.AFTER
+            )
+        else:
+            doc = await self._acollection.find_one(q)
+        if doc is None:
+            return None
+        return Item(
+            value=doc["value"],
+            key=doc.get("logical_key", doc["key"]),
+            namespace=tuple(doc["namespace"]),
+            created_at=doc.get("created"),
+            updated_at=doc.get("created"),
         )
 
     async def asearch(
@@ -428,20 +859,30 @@ class MongoDBBaseStore(BaseStore):
         limit: int = 10,
         offset: int = 0,
         refresh_ttl: Optional[bool] = None,
+        query_vector: Optional[List[float]] = None,
     ) -> List[SearchItem]:
-        loop = asyncio.get_running_loop()
-        return await loop.run_in_executor(
-            None,
-            partial(
-                self.search,
-                namespace_prefix,
-                query=query,
-                filter=filter,
-                limit=limit,
-                offset=offset,
-                refresh_ttl=refresh_ttl,
-            ),
-        )
+        await self.aflush()
+        if self.semantic_enabled:
+            if query_vector is None:
+                query_vector = await self._aembed_query(query or "")
+            pipeline = self._semantic_pipeline(query_vector, namespace_prefix, filter, limit, offset)
+            try:
+                docs = await self._acollection.aggregate(pipeline).to_list(length=None)
+            except pymongo.errors.OperationFailure as e:
+                logging.error("Error running semantic search: %s", e)
+                docs = []
+        else:
+            q, projection = self._text_query(namespace_prefix, filter, query)
+            docs = await (
+                self._acollection.find(q, projection=projection)
+                .sort([("score", {"$meta": "textScore"})])
+                .skip(offset)
+                .limit(limit)
+            ).to_list(length=None)
+        ttl_ops = self._ttl_refresh_ops(docs) if refresh_ttl else []
+        if ttl_ops:
+            await self._aunacked_collection.bulk_write(ttl_ops, ordered=False)
+        return [_to_search_item(doc) for doc in docs]
 
     async def aput(
         self,
@@ -452,14 +893,12 @@ class MongoDBBaseStore(BaseStore):
         *,
         ttl: Union[Optional[float], _NotProvidedSentinel] = NOT_PROVIDED,
     ) -> None:
-        loop = asyncio.get_running_loop()
-        await loop.run_in_executor(
-            None, partial(self.put, namespace, key, value, index, ttl=ttl)
-        )
+        await self._aput_docs([self._build_doc(namespace, key, value, index, ttl)])
 
     async def adelete(self, namespace: Tuple[str, ...], key: str) -> None:
-        loop = asyncio.get_running_loop()
-        await loop.run_in_executor(None, partial(self.delete, namespace, key))
+        await self.aflush()
+        q = {**self._namespace_query(namespace), "key": key}
+        await self._acollection.delete_one(q)
 
     async def alist_namespaces(
         self,
@@ -470,15 +909,7 @@ class MongoDBBaseStore(BaseStore):
         limit: int = 100,
         offset: int = 0,
     ) -> List[Tuple[str, ...]]:
-        loop = asyncio.get_running_loop()
-        return await loop.run_in_executor(
-            None,
-            partial(
-                self.list_namespaces,
-                prefix=prefix,
-                suffix=suffix,
-                max_depth=max_depth,
-                limit=limit,
-                offset=offset,
-            ),
-        )
\ No newline at end of file
+        await self.aflush()
+        pipeline = self._list_namespaces_pipeline(prefix, suffix, max_depth, limit, offset)
+        docs = await self._acollection.aggregate(pipeline).to_list(length=None)
+        return [tuple(doc["_id"]) for doc in docs]
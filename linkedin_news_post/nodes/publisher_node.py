@@ -1,6 +1,8 @@
+import asyncio
 import os
 
 from linkedin_news_post import State
+from linkedin_news_post import publishing
 from langgraph.constants import END
 
 from langgraph.types import Command
@@ -10,31 +12,45 @@ from langgraph.store.base import BaseStore
 from pydantic import BaseModel, Field
 from langmem import create_memory_store_manager
 from linkedin_news_post.chains import publisher_chain
+from linkedin_news_post.chains.history import trim_history
 
 class Article(BaseModel):
     article: str = Field(description="Very concise description of what the published article is about")
 
 
-def publisher_node(state: State, store: BaseStore) -> Command[Literal["tool_node"]]:
-
-    # Memory Managment
-    manager = create_memory_store_manager(
-        "gpt-4o",
-        namespace=("articles",),
-        schemas=[Article],
-        instructions="Extract the information from the most recent article written by the writer_node message, which will be the newly published article about to be released. Add 1 new entry for the article to the collection, including details such as dates and statistics for future reference, while avoiding content redundancy.",
-        store=store,
-        enable_inserts=True
-    )
-
-    manager.invoke({"messages": state["messages"]})
-
-    result = publisher_chain.invoke(state)
+# Memory Managment, built once; without store= it writes to the graph's store at invoke time
+manager = create_memory_store_manager(
+    "gpt-4o",
+    namespace=("articles",),
+    schemas=[Article],
+    instructions="Extract the information from the most recent article written by the writer_node message, which will be the newly published article about to be released. Add 1 new entry for the article to the collection, including details such as dates and statistics for future reference, while avoiding content redundancy.",
+    enable_inserts=True
+)
+
+async def publisher_node(state: State, store: BaseStore) -> Command[Literal["tool_node"]]:
+
+    # quality_node hands over the publish lock with its approval; a publish the supervisor
+    # routed here directly takes the lock itself, so publishing stays one run at a time
+    if not state.get("publish_lock_held"):
+        await publishing.lock.acquire()
+    try:
+        # Recording the article and publishing it are independent
+        _, result = await asyncio.gather(
+            # Only the recent turns (with the new article) matter to the memory manager
+            manager.ainvoke({"messages": trim_history(state["messages"])}),
+            publisher_chain.ainvoke(state)
+        )
+        # The store buffers puts; write the article record out now so a later failure or a
+        # run that never reaches run_graph's flush cannot lose it and let a duplicate through
+        await store.aflush()
+    finally:
+        publishing.lock.release()
 
     return Command(
         goto="tool_node",
         update={
-            "messages": [result]
+            "messages": [result],
+            "publish_lock_held": False
         }
     )
 
@@ -1,28 +1,123 @@
+import hashlib
+from collections import OrderedDict
 
 from linkedin_news_post import State
+from linkedin_news_post import speculation
+from linkedin_news_post import publishing
 from langgraph.types import Command
 from langchain_core.messages import HumanMessage
 
 from langgraph.store.base import BaseStore
 
 from linkedin_news_post.chains import quality_chain
+from linkedin_news_post.semantic_cache import LSHBucketCache, SemanticLLMCache
+from linkedin_news_post.store import aembed_text
 from typing import Literal
 
-def quality_node(state: State, store: BaseStore) -> Command[Literal["supervisor_node"]]:
+# Drafts that embed within cosine 0.97 of a rejected one are rejected again without
+# an LLM call. ada-002 puts related quant-finance texts well above 0.9, so anything
+# looser would reject new drafts unseen (and bypass the prompt's rule to approve after
+# three rejections). Approvals are not cached: replaying one would republish a duplicate.
+verdict_cache = SemanticLLMCache(threshold=0.97)
 
-    
-    # Semantic serach using proposed article
-    past_articles = store.search(("articles",), query=state["messages"][-2].content, limit=3)
+# Past articles by LSH bucket of the draft embedding, so a revised draft skips the search.
+# A hit is only reused when the stored draft is within cosine 0.95, since checking against
+# another draft's neighbours could approve a duplicate; cleared once an article is approved.
+past_articles_cache = LSHBucketCache(planes=16, max_entries=256, threshold=0.95)
 
+# Verdict given to each exact draft, by BLAKE2b of its text, kept across approvals so a
+# re-emitted draft is not rechecked
+EXACT_CACHE_SIZE = 256
+_last_verdict: "OrderedDict[bytes, object]" = OrderedDict()
 
-    result = quality_chain.invoke({
-        "messages": state["messages"],
-        "past_articles": past_articles
-    })
+def _draft_key(text: str) -> bytes:
+    return hashlib.blake2b(text.encode(), digest_size=16).digest()
 
+def _record_verdict(key: bytes, verdict) -> None:
+    _last_verdict[key] = verdict
+    _last_verdict.move_to_end(key)
+    if len(_last_verdict) > EXACT_CACHE_SIZE:
+        _last_verdict.popitem(last=False)
 
+def _reject(state: State, feedback: str, suggested_topic=None) -> Command:
+    update = {"messages": [HumanMessage(content=feedback, name="quality_node")]}
+    if suggested_topic:
+        # The writer's speculative query predates this verdict; drop it so researcher_node
+        # searches with the feedback and suggested topic instead
+        speculation.discard(state.get("speculative_research"))
+        update["speculative_research"] = None
+    # Otherwise researcher_node picks up the query the writer started speculatively
+    return Command(goto="researcher_node", update=update)
 
-    return Command(
-        goto="supervisor_node",
-        update={"messages": [HumanMessage(content=result.content, name="quality_node")]}
-    )
\ No newline at end of file
+async def _fetch_past_articles(store: BaseStore, article_vector):
+    # Semantic serach using the whole proposed article
+    past_articles = await store.asearch(("articles",), limit=3, query_vector=article_vector)
+    past_articles_cache.put(article_vector, past_articles)
+    return past_articles
+
+def _rejection_feedback(verdict) -> str:
+    feedback = f"Rejected: {verdict.reason}"
+    if verdict.suggested_topic:
+        feedback += f" Suggested topic: {verdict.suggested_topic}"
+    return feedback
+
+async def quality_node(state: State, store: BaseStore) -> Command[Literal["publisher_node", "researcher_node"]]:
+
+
+    # The draft being checked, read once for the hash and the embedding
+    text = state["messages"][-2].content
+    key = _draft_key(text)
+
+    # A byte-identical draft gets its earlier verdict back without any lookup. One that
+    # was approved has been published already, so it is rejected instead of republished.
+    previous = _last_verdict.get(key)
+    if previous is not None:
+        _last_verdict.move_to_end(key)
+        if previous.approved:
+            return _reject(state, "Rejected: this exact article was already approved for publishing.")
+        return _reject(state, _rejection_feedback(previous), previous.suggested_topic)
+
+    # The draft is embedded once and shared by the verdict cache and the search
+    article_vector = await aembed_text(text)
+
+    # The verdict cache is checked first: the search flushes buffered puts, so it is not
+    # started (and then cancelled mid-flush) when the LLM call will be skipped anyway
+    verdict = verdict_cache.get(article_vector)
+    if verdict is None:
+        # Checked under the publish lock so no other run publishes between this check
+        # and our own publish; kept on approval and released by publisher_node
+        await publishing.lock.acquire()
+        try:
+            past_articles = past_articles_cache.get(article_vector)
+            if past_articles is None:
+                past_articles = await _fetch_past_articles(store, article_vector)
+
+            verdict = await quality_chain.ainvoke({
+                "messages": state["messages"],
+                "past_articles": past_articles
+            })
+        except BaseException:
+            publishing.lock.release()
+            raise
+        if not verdict.approved:
+            publishing.lock.release()
+            verdict_cache.put(article_vector, verdict)
+    _record_verdict(key, verdict)
+
+    # Branch on the verdict directly instead of asking the supervisor to interpret it
+    if verdict.approved:
+
+        speculation.discard(state.get("speculative_research"))
+        # The article is about to be stored, cached past articles would miss it
+        past_articles_cache.clear()
+
+        return Command(
+            goto="publisher_node",
+            update={
+                "messages": [HumanMessage(content=f"Approved: {verdict.reason}", name="quality_node")],
+                "speculative_research": None,
+                "publish_lock_held": True
+            }
+        )
+
+    return _reject(state, _rejection_feedback(verdict), verdict.suggested_topic)
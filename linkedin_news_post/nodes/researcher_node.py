@@ -1,22 +1,32 @@
 
 from linkedin_news_post import State
+from linkedin_news_post import speculation
 from linkedin_news_post.chains import researcher_chain
-from langchain_core.messages import HumanMessage
 
 from langgraph.types import Command
 from typing import Literal
 
-def researcher_node(state: State) -> Command[Literal["tool_node"]]:
+async def researcher_node(state: State) -> Command[Literal["tool_node"]]:
 
-    new_messages = state["messages"] + [HumanMessage(content=f"Tell me news about quantitative finance picking a topic of your choice")]
-    result = researcher_chain.invoke({
-        "messages": new_messages
-    })
+    # Reuse the query started speculatively after the last article was written
+    result = await speculation.consume(state.get("speculative_research"))
+
+    if result is None:
+        msgs = state["messages"]
+        instruction = "Tell me news about quantitative finance picking a topic of your choice"
+        if msgs and msgs[-1].name == "quality_node":
+            # Sent back by the quality check: its reason and suggested topic steer the search
+            instruction += f". Follow this feedback on the last article: {msgs[-1].content}"
+        result = await researcher_chain.ainvoke({
+            "messages": msgs,
+            "instruction": instruction
+        })
 
     return Command(
         goto="tool_node",
         update={
-            "messages": [result]
+            "messages": [result],
+            "speculative_research": None
         }
     )
 
@@ -1,6 +1,7 @@
-
+import logging
 
 from linkedin_news_post import State
+from linkedin_news_post import speculation
 from linkedin_news_post.chains import supervisor_chain
 from langchain_core.messages import HumanMessage
 from langgraph.constants import END
@@ -8,44 +9,33 @@ from langgraph.constants import END
 from langgraph.types import Command
 from typing import Literal
 
-def supervisor_node(state: State) -> Command[Literal["publisher_node", "researcher_node", "writer_node", "quality_node", "__end__"]]:
-
-    result = supervisor_chain.invoke(state)
-
-    print(state["messages"])
-
-    if result.next_node == "researcher_node":
+logger = logging.getLogger(__name__)
 
-        return Command(
-            goto="researcher_node",
-            update={"messages": [HumanMessage(content="Passing to researcher...", name="supervisor_node")]}
-        )
+# next_node chosen by the supervisor -> (node to go to, hand-off message)
+_DISPATCH = {
+    "researcher_node": ("researcher_node", "Passing to researcher..."),
+    "writer_node": ("writer_node", "Passing to writer..."),
+    "quality_node": ("quality_node", "Passing to quality checker..."),
+    "publisher_node": ("publisher_node", "Passing to publisher..."),
+    "end_node": (END, "Finishing the Process..."),
+}
 
-    elif result.next_node == "writer_node":
+_FINAL = {"publisher_node", END}
 
-        return Command(
-            goto="writer_node",
-            update={"messages": [HumanMessage(content="Passing to writer...", name="supervisor_node")]}
-        )
-    
-    elif result.next_node == "quality_node":
+async def supervisor_node(state: State) -> Command[Literal["publisher_node", "researcher_node", "writer_node", "quality_node", "__end__"]]:
 
-        return Command(
-            goto="quality_node",
-            update={"messages": [HumanMessage(content="Passing to quality checker...", name="supervisor_node")]}
-        )
+    result = await supervisor_chain.ainvoke(state)
 
-    elif result.next_node == "publisher_node":
+    if logger.isEnabledFor(logging.DEBUG):
+        msgs = state["messages"]
+        logger.debug("supervisor state: %d messages: %s", len(msgs), msgs)
 
-        return Command(
-            goto="publisher_node",
-            update={"messages": [HumanMessage(content="Passing to publisher...", name="supervisor")]}
-        )
-    
-    elif result.next_node == "end_node":
+    goto, message = _DISPATCH[result.next_node]
+    update = {"messages": [HumanMessage(content=message, name="supervisor_node")]}
 
-        return Command(
-            goto={END},
-            update={"messages": [HumanMessage(content="Finishing the Process...", name="supervisor")]}
-        )
+    if goto in _FINAL:
+        # Nothing left to research, the speculative query is not needed
+        speculation.discard(state.get("speculative_research"))
+        update["speculative_research"] = None
 
+    return Command(goto=goto, update=update)
@@ -1,19 +1,36 @@
-
 from linkedin_news_post import State
-from linkedin_news_post.chains import writer_chain
+from linkedin_news_post import speculation
+from linkedin_news_post.chains import writer_chain, researcher_chain
 from langchain_core.messages import HumanMessage
 
-from langgraph.types import Command
+from langgraph.types import Command, StreamWriter
 from typing import Literal
 
-def writer_node(state: State) -> Command[Literal["supervisor_node"]]:
+async def writer_node(state: State, writer: StreamWriter) -> Command[Literal["supervisor_node"]]:
+
+    chunks = []
+    async for chunk in writer_chain.astream(state):
+        chunks.append(chunk.content)
+        # Surface the draft to stream_mode="custom" consumers as it is generated
+        writer({"article_chunk": chunk.content})
+    content = "".join(chunks)
 
-    result = writer_chain.invoke(state)
+    article = HumanMessage(content=content, name="writer_node")
+
+    # Start the next research query now so a rejection does not wait on it
+    speculation.discard(state.get("speculative_research"))
+    task_id = speculation.launch(
+        researcher_chain.ainvoke({
+            "messages": state["messages"] + [article],
+            "instruction": "Tell me news about quantitative finance picking a topic different from the one in the latest article"
+        })
+    )
 
     return Command(
         goto="supervisor_node",
         update={
-            "messages": [HumanMessage(content=result.content, name="writer_node")]
+            "messages": [article],
+            "speculative_research": task_id
         }
     )
 
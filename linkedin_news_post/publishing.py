@@ -0,0 +1,7 @@
+import asyncio
+
+# Concurrent graph runs share the article store. An approval only stays valid until
+# another run publishes, so the final quality check and the publish that follows it
+# (through the flush of the article record) run under this lock, one run at a time.
+# quality_node acquires it and, on approval, publisher_node releases it.
+lock = asyncio.Lock()
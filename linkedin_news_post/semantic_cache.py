@@ -0,0 +1,137 @@
+import time
+from collections import OrderedDict
+from typing import Any, List, Optional, Tuple
+
+import numpy as np
+
+
+class SemanticLLMCache:
+    """Reuse an LLM answer when a new input embeds close enough to one already seen.
+
+    Embeddings live L2-normalised in the first ``_size`` rows of a float32 buffer that
+    doubles when full, so a lookup is a single matmul with a normalised query. Entries
+    expire after ``ttl_seconds`` and the least recently used one is evicted once
+    ``max_entries`` is reached.
+    """
+
+    def __init__(self, threshold: float = 0.92, max_entries: int = 256, ttl_seconds: float = 3600.0):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._buffer: Optional[np.ndarray] = None
+        self._size = 0
+        self._values: List[Any] = []
+        self._created: List[float] = []
+        self._last_used: List[float] = []
+
+    @staticmethod
+    def _normalize(vector: List[float]) -> np.ndarray:
+        q = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(q)
+        return q / norm if norm else q
+
+    def _remove(self, rows: List[int]) -> None:
+        keep = np.ones(self._size, dtype=bool)
+        keep[rows] = False
+        kept = int(keep.sum())
+        self._buffer[:kept] = self._buffer[:self._size][keep]
+        self._size = kept
+        self._values = [v for v, k in zip(self._values, keep) if k]
+        self._created = [t for t, k in zip(self._created, keep) if k]
+        self._last_used = [t for t, k in zip(self._last_used, keep) if k]
+
+    def _expire(self, now: float) -> None:
+        expired = [i for i, created in enumerate(self._created) if now - created > self.ttl_seconds]
+        if expired:
+            self._remove(expired)
+
+    def _append(self, row: np.ndarray) -> None:
+        if self._buffer is None:
+            self._buffer = np.empty((16, row.shape[0]), dtype=np.float32)
+        elif self._size == self._buffer.shape[0]:
+            grown = np.empty((self._size * 2, row.shape[0]), dtype=np.float32)
+            grown[:self._size] = self._buffer
+            self._buffer = grown
+        self._buffer[self._size] = row
+        self._size += 1
+
+    def search(self, vector: List[float], limit: int = 1) -> List[Tuple[Any, float]]:
+        """Return up to ``limit`` cached values at or above the threshold, best first."""
+        now = time.monotonic()
+        self._expire(now)
+        if not self._size:
+            return []
+        scores = self._buffer[:self._size] @ self._normalize(vector)
+        if limit < self._size:
+            top = np.argpartition(-scores, limit)[:limit]
+        else:
+            top = np.arange(self._size)
+        top = top[np.argsort(-scores[top])]
+        hits = []
+        for row in top:
+            if scores[row] < self.threshold:
+                break
+            self._last_used[row] = now
+            hits.append((self._values[row], float(scores[row])))
+        return hits
+
+    def get(self, vector: List[float]) -> Optional[Any]:
+        hits = self.search(vector, limit=1)
+        return hits[0][0] if hits else None
+
+    def put(self, vector: List[float], value: Any) -> None:
+        now = time.monotonic()
+        self._expire(now)
+        if self._size >= self.max_entries:
+            self._remove([int(np.argmin(self._last_used))])
+        self._append(self._normalize(vector))
+        self._values.append(value)
+        self._created.append(now)
+        self._last_used.append(now)
+
+
+class LSHBucketCache:
+    """Keep the latest value per locality-sensitive hash bucket of an embedding.
+
+    The signature is the sign of the embedding against ``planes`` random hyperplanes,
+    drawn on the first lookup once the dimension is known. Nearby embeddings tend to
+    share a signature, so a revised input finds the value stored for the previous one.
+    A bucket can still hold an unrelated input, so each entry keeps its source vector
+    and is only returned when its cosine with the lookup is at least ``threshold``.
+    """
+
+    def __init__(self, planes: int = 16, max_entries: int = 256, threshold: float = 0.95, seed: int = 0):
+        self.planes = planes
+        self.max_entries = max_entries
+        self.threshold = threshold
+        self.seed = seed
+        self._planes: Optional[np.ndarray] = None
+        self._buckets: "OrderedDict[bytes, Tuple[np.ndarray, Any]]" = OrderedDict()
+
+    def _signature(self, vector: List[float]) -> bytes:
+        q = np.asarray(vector, dtype=np.float32)
+        if self._planes is None:
+            rng = np.random.default_rng(self.seed)
+            self._planes = rng.standard_normal((self.planes, q.shape[0])).astype(np.float32)
+        return np.packbits(self._planes @ q > 0).tobytes()
+
+    def get(self, vector: List[float]) -> Optional[Any]:
+        key = self._signature(vector)
+        entry = self._buckets.get(key)
+        if entry is None:
+            return None
+        source, value = entry
+        if float(source @ SemanticLLMCache._normalize(vector)) < self.threshold:
+            return None
+        self._buckets.move_to_end(key)
+        return value
+
+    def put(self, vector: List[float], value: Any) -> None:
+        key = self._signature(vector)
+        self._buckets[key] = (SemanticLLMCache._normalize(vector), value)
+        self._buckets.move_to_end(key)
+        if len(self._buckets) > self.max_entries:
+            self._buckets.popitem(last=False)
+
+    def clear(self) -> None:
+        self._buckets.clear()
@@ -0,0 +1,34 @@
+import asyncio
+import logging
+import uuid
+from typing import Any, Awaitable, Dict, Optional
+
+# Background tasks started ahead of the node that needs their result. Only
+# the task id is kept in the graph state so that it stays serializable.
+_tasks: Dict[str, asyncio.Task] = {}
+
+
+def launch(coro: Awaitable[Any]) -> str:
+    """Schedule coro on the running loop and return the id used to claim it."""
+    task_id = str(uuid.uuid4())
+    _tasks[task_id] = asyncio.ensure_future(coro)
+    return task_id
+
+
+async def consume(task_id: Optional[str]) -> Optional[Any]:
+    """Wait for a speculative task, returning None if it is unknown or failed."""
+    task = _tasks.pop(task_id, None) if task_id else None
+    if task is None:
+        return None
+    try:
+        return await task
+    except Exception as e:
+        logging.warning("Speculative task %s failed: %s", task_id, e)
+        return None
+
+
+def discard(task_id: Optional[str]) -> None:
+    """Cancel a speculative task whose result is no longer needed."""
+    task = _tasks.pop(task_id, None) if task_id else None
+    if task is not None:
+        task.cancel()
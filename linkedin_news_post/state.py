@@ -1,6 +1,6 @@
 
 
-from typing import TypedDict, Annotated
+from typing import TypedDict, Annotated, Optional
 from langchain_core.messages import AnyMessage
 from langgraph.graph import add_messages
 
@@ -8,3 +8,7 @@ from langgraph.graph import add_messages
 
 class State(TypedDict):
     messages: Annotated[list[AnyMessage], add_messages]
+    # Id of the background researcher query started once an article is written
+    speculative_research: Optional[str]
+    # Set by quality_node on approval: it holds publishing.lock for publisher_node to release
+    publish_lock_held: Optional[bool]
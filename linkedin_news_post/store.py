@@ -0,0 +1,62 @@
+import os
+from collections import OrderedDict
+from functools import lru_cache
+
+from linkedin_news_post.mongo_store import MongoDBBaseStore
+from langchain_openai import OpenAIEmbeddings
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+CONNECTION_STRING = os.environ["MONGODB_URI"]
+
+
+openai_embeddings = OpenAIEmbeddings()
+
+# Repeated queries (e.g. the same draft checked again by the quality node) reuse their embedding
+EMBED_CACHE_SIZE = 2048
+
+@lru_cache(maxsize=EMBED_CACHE_SIZE)
+def embed_text(text: str) -> list[float]:
+    return openai_embeddings.embed_query(text)
+
+def embed_texts(texts: list[str]) -> list[list[float]]:
+    return openai_embeddings.embed_documents(texts)
+
+_aembed_cache: "OrderedDict[str, list[float]]" = OrderedDict()
+
+async def aembed_text(text: str) -> list[float]:
+    vector = _aembed_cache.get(text)
+    if vector is not None:
+        _aembed_cache.move_to_end(text)
+        return vector
+    vector = await openai_embeddings.aembed_query(text)
+    _aembed_cache[text] = vector
+    if len(_aembed_cache) > EMBED_CACHE_SIZE:
+        _aembed_cache.popitem(last=False)
+    return vector
+
+async def aembed_texts(texts: list[str]) -> list[list[float]]:
+    return await openai_embeddings.aembed_documents(texts)
+
+index_config = {
+    "embed": embed_text,     
+    "embed_batch": embed_texts,
+    "aembed": aembed_text,
+    "aembed_batch": aembed_texts,
+    "fields": ["content.article", "summary"],
+    "index_name": "store_index",
+}
+
+mongo_store = MongoDBBaseStore(
+    mongo_url=CONNECTION_STRING,   
+    db_name="checkpointing_db",                
+    collection_name="store",    
+    index_config=index_config,
+    ttl_support=True,
+    # Puts are embedded in batches of up to 32; run_graph flushes the rest when it finishes
+    fast_insert=True,
+    flush_size=32
+)
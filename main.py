@@ -1,15 +1,30 @@
 import asyncio
 
 from linkedin_news_post.graph import make_graph
+from linkedin_news_post.store import mongo_store
 
 
-async def run_graph():
+# Bounds the concurrent runs, and with them the concurrent LLM requests
+MAX_CONCURRENT_RUNS = 8
+
+
+async def run_graph(prompts):
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_RUNS)
+
     async with make_graph() as graph:
 
-        await graph.ainvoke({"messages": [
-            ("user", "Publish a linkedin article")
-        ]})
-    
+        async def run_one(prompt):
+            async with semaphore:
+                return await graph.ainvoke({"messages": [
+                    ("user", prompt)
+                ]})
+
+        try:
+            return await asyncio.gather(*(run_one(prompt) for prompt in prompts))
+        finally:
+            # Write out (and embed) any puts still buffered by the store
+            await mongo_store.aflush()
+
 
 
-asyncio.run(run_graph())
\ No newline at end of file
+asyncio.run(run_graph(["Publish a linkedin article"]))
\ No newline at end of file